@@ -1,11 +1,13 @@
 import math
+import operator
 import sys
 import ast
-from dataclasses import dataclass
-from typing import Any
+from functools import partial
+from types import CodeType
+from typing import Any, Callable, NamedTuple
 
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QFont, QAction, QIcon, QKeySequence
+from PySide6.QtCore import Qt, QSize, QTimer
+from PySide6.QtGui import QFont, QIcon, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QApplication,
     QGridLayout,
@@ -19,20 +21,22 @@ from PySide6.QtWidgets import (
 )
 
 
-@dataclass
-class TokenMapping:
+class TokenMapping(NamedTuple):
     label: str
     value: str
     role: str  # 'digit', 'op', 'action'
 
 
 class SafeEvaluator:
+    # Unicode operator symbols and their Python equivalents
+    _TRANS = str.maketrans({'×': '*', '÷': '/', '−': '-'})
+    PROG_CACHE_SIZE = 512
+
     def __init__(self) -> None:
         self.allowed_nodes = (
             ast.Expression,
             ast.BinOp,
             ast.UnaryOp,
-            ast.Num,
             ast.Constant,
             ast.Add,
             ast.Sub,
@@ -46,9 +50,6 @@ class SafeEvaluator:
             ast.Load,
             ast.Call,  # Only for allowed functions below
             ast.Name,
-            ast.Tuple,
-            ast.List,
-            ast.MatMult,  # will reject in evaluator below
         )
         self.allowed_names = {
             # common constants
@@ -64,83 +65,232 @@ class SafeEvaluator:
             'abs': abs,
             'round': round,
         }
+        # Names visible to compiled expressions; '_pow' cannot clash with user
+        # input because identifiers are checked against allowed_names first
+        self._namespace = dict(self.allowed_names, _pow=self._pow)
+        # Security checks for individual node types, run once per expression
+        self._validators = {
+            ast.Constant: self._v_const,
+            ast.UnaryOp: self._v_unop,
+            ast.BinOp: self._v_binop,
+            ast.Call: self._v_call,
+            ast.Name: self._v_name,
+        }
+        # Rewrites applied to an already validated tree before compiling
+        self._dispatch = {
+            ast.UnaryOp: self._c_unop,
+            ast.BinOp: self._c_binop,
+            ast.Call: self._c_call,
+            ast.Name: self._c_name,
+        }
+        # Allowed operators, mapped to their implementations for constant folding
+        self._unops = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+        self._binops = {
+            ast.Add: operator.add,
+            ast.Sub: operator.sub,
+            ast.Mult: operator.mul,
+            ast.Div: operator.truediv,
+            ast.FloorDiv: operator.floordiv,
+            ast.Mod: operator.mod,
+            ast.Pow: self._pow,
+        }
+        self._globals = {'__builtins__': {}}
+        # Compiled code only depends on the sanitized text (allowed_names never
+        # changes), so repeated preview/equals calls skip parsing entirely
+        self._prog_cache: dict[str, CodeType] = {}
 
     def evaluate(self, expression: str) -> float:
-        # Replace unicode operator symbols with Python equivalents
-        sanitized = (
-            expression.replace('×', '*')
-            .replace('÷', '/')
-            .replace('−', '-')
-        )
+        sanitized = expression.translate(self._TRANS)
+        code = self._prog_cache.get(sanitized)
+        if code is None:
+            code = self._compile(sanitized)
+            if len(self._prog_cache) >= self.PROG_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._prog_cache[next(iter(self._prog_cache))]
+            self._prog_cache[sanitized] = code
+        return eval(code, self._globals, self._namespace)
+
+    def _compile(self, sanitized: str) -> CodeType:
         try:
             node = ast.parse(sanitized, mode='eval')
         except SyntaxError:
             raise ValueError('Invalid expression')
-        return self._eval(node.body)
-
-    def _eval(self, node: ast.AST) -> Any:
-        if not isinstance(node, self.allowed_nodes):
-            raise ValueError('Disallowed expression')
-
-        if isinstance(node, ast.Constant):
-            if isinstance(node.value, (int, float)):
-                return node.value
+        self._validate(node)
+        node.body = self._rewrite(node.body)
+        return compile(ast.fix_missing_locations(node), '<expr>', 'eval')
+
+    def _validate(self, root: ast.AST) -> None:
+        validators = self._validators
+        for node in ast.walk(root):
+            if not isinstance(node, self.allowed_nodes):
+                raise ValueError('Disallowed expression')
+            validator = validators.get(type(node))
+            if validator is not None:
+                validator(node)
+
+    def _v_const(self, node: ast.Constant) -> None:
+        if not isinstance(node.value, (int, float)):
             raise ValueError('Invalid constant')
 
-        if isinstance(node, ast.Num):
-            return node.n
-
-        if isinstance(node, ast.UnaryOp):
-            operand = self._eval(node.operand)
-            if isinstance(node.op, ast.UAdd):
-                return +operand
-            if isinstance(node.op, ast.USub):
-                return -operand
+    def _v_unop(self, node: ast.UnaryOp) -> None:
+        if type(node.op) not in self._unops:
             raise ValueError('Unsupported unary operator')
 
-        if isinstance(node, ast.BinOp):
-            left = self._eval(node.left)
-            right = self._eval(node.right)
-            if isinstance(node.op, ast.Add):
-                return left + right
-            if isinstance(node.op, ast.Sub):
-                return left - right
-            if isinstance(node.op, ast.Mult):
-                return left * right
-            if isinstance(node.op, ast.Div):
-                return left / right
-            if isinstance(node.op, ast.FloorDiv):
-                return left // right
-            if isinstance(node.op, ast.Mod):
-                return left % right
-            if isinstance(node.op, ast.Pow):
-                # Avoid massive exponentiation
-                if abs(left) > 1e6 or abs(right) > 10:
-                    raise ValueError('Exponent too large')
-                return left ** right
+    def _v_binop(self, node: ast.BinOp) -> None:
+        if type(node.op) not in self._binops:
             raise ValueError('Unsupported operator')
 
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id in self.allowed_names:
-                func = self.allowed_names[node.func.id]
-                args = [self._eval(arg) for arg in node.args]
-                return func(*args)
+    def _v_call(self, node: ast.Call) -> None:
+        if not (isinstance(node.func, ast.Name) and node.func.id in self.allowed_names):
             raise ValueError('Function not allowed')
 
-        if isinstance(node, ast.Name):
-            if node.id in self.allowed_names:
-                return self.allowed_names[node.id]
+    def _v_name(self, node: ast.Name) -> None:
+        if node.id not in self.allowed_names:
             raise ValueError('Unknown identifier')
 
-        raise ValueError('Invalid expression')
+    def _rewrite(self, node: ast.expr) -> ast.expr:
+        # No security checks here: the tree has already been through _validate
+        handler = self._dispatch.get(type(node))
+        return node if handler is None else handler(node)
+
+    def _fold(self, node: ast.expr, func: Any, *args: Any) -> ast.expr:
+        # Replace a constant subtree with its value; anything that fails is
+        # left in place so it raises the same way at evaluation time
+        try:
+            value = func(*args)
+        except Exception:
+            return node
+        if not isinstance(value, (int, float)):
+            return node
+        return ast.copy_location(ast.Constant(value), node)
+
+    def _c_unop(self, node: ast.UnaryOp) -> ast.expr:
+        node.operand = operand = self._rewrite(node.operand)
+        if isinstance(operand, ast.Constant):
+            return self._fold(node, self._unops[type(node.op)], operand.value)
+        return node
+
+    def _c_binop(self, node: ast.BinOp) -> ast.expr:
+        node.left = left = self._rewrite(node.left)
+        node.right = right = self._rewrite(node.right)
+        if isinstance(left, ast.Constant) and isinstance(right, ast.Constant):
+            folded = self._fold(node, self._binops[type(node.op)], left.value, right.value)
+            if isinstance(folded, ast.Constant):
+                return folded
+        if type(node.op) is ast.Pow:
+            # Route through the bounded helper to avoid massive exponentiation
+            call = ast.Call(
+                func=ast.Name(id='_pow', ctx=ast.Load()),
+                args=[node.left, node.right],
+                keywords=[],
+            )
+            return ast.copy_location(call, node)
+        return node
+
+    def _c_call(self, node: ast.Call) -> ast.expr:
+        node.args = [self._rewrite(arg) for arg in node.args]
+        values = [arg.value for arg in node.args if isinstance(arg, ast.Constant)]
+        if len(values) == len(node.args):
+            assert isinstance(node.func, ast.Name)  # guaranteed by _v_call
+            return self._fold(node, self.allowed_names[node.func.id], *values)
+        return node
+
+    def _c_name(self, node: ast.Name) -> ast.expr:
+        # Numeric constants such as pi; function names are left alone
+        return self._fold(node, self.allowed_names.get, node.id)
+
+    @staticmethod
+    def _pow(left: Any, right: Any) -> Any:
+        if abs(left) > 1e6 or abs(right) > 10:
+            raise ValueError('Exponent too large')
+        return left ** right
 
 
 class CalculatorWindow(QMainWindow):
+    # Single-character operator tokens; '**' is handled separately
+    _OP_CHARS = frozenset('+−×÷')
+    # Trailing characters that always leave an expression unparseable
+    _INCOMPLETE_TAIL = frozenset('+-−×÷*/(')
+
+    # Custom accent and glass styles, layered over the base theme
+    _CUSTOM_QSS = """
+        QWidget {
+            background-color: #0f1226;
+        }
+        #Preview {
+            color: #92a0b3;
+            padding: 6px 10px;
+            font-size: 13px;
+        }
+        #Display {
+            color: #e6f1ff;
+            background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:1,
+                                        stop:0 rgba(23, 30, 64, 190),
+                                        stop:1 rgba(21, 18, 40, 190));
+            border: 1px solid rgba(255, 255, 255, 24);
+            border-radius: 14px;
+            padding: 12px 16px;
+            selection-background-color: #3a65ff;
+            selection-color: white;
+        }
+        QPushButton {
+            font: 600 18px 'Inter';
+            border-radius: 14px;
+            padding: 10px 14px;
+            border: 1px solid rgba(255, 255, 255, 18);
+            color: #e6f1ff;
+        }
+        QPushButton#BtnPrimary {
+            background: qlineargradient(spread:pad, x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #1e274f, stop:1 #141a36);
+        }
+        QPushButton#BtnSecondary {
+            background: qlineargradient(spread:pad, x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #1a203f, stop:1 #10142b);
+            color: #b9c7dd;
+        }
+        QPushButton#BtnAccent {
+            background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:1,
+                                        stop:0 #6d3aff, stop:1 #3a65ff);
+            border: 0px solid transparent;
+            color: white;
+        }
+        QPushButton#BtnUtility {
+            background: qlineargradient(spread:pad, x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #182045, stop:1 #0f1631);
+            color: #d2dcf1;
+        }
+        QPushButton:hover {
+            filter: brightness(110%);
+        }
+        QPushButton:pressed {
+            transform: translateY(1px);
+            filter: brightness(96%);
+        }
+        """
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle('Aurora Calculator')
         self.setMinimumSize(420, 620)
         self.evaluator = SafeEvaluator()
+        # Python-side copy of the display text, so handlers never read it back from Qt
+        self._buf = '0'
+        # Coalesce bursts of input into a single preview evaluation
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(50)
+        self._preview_timer.timeout.connect(self._do_update_preview)
+        # Keyboard shortcuts: digits and operators, then Enter/Return, Backspace and Escape
+        self._shortcut_map: dict[Any, Callable[[], None]] = {
+            key: partial(self._key_input, key) for key in '0123456789+-*/().'
+        }
+        self._shortcut_map.update({
+            Qt.Key_Return: self._on_equals,
+            Qt.Key_Enter: self._on_equals,
+            Qt.Key_Backspace: self._on_backspace,
+            Qt.Key_Escape: self._on_clear,
+        })
         self._build_ui()
         self._apply_theme()
         self.current_expression = ''
@@ -155,10 +305,12 @@ class CalculatorWindow(QMainWindow):
         self.display = QLineEdit()
         self.display.setReadOnly(True)
         self.display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.display.setText('0')
+        self.display.setText(self._buf)
         self.display.setMinimumHeight(88)
         self.display.setFont(QFont('Inter', 32))
         self.display.setObjectName('Display')
+        # Every display change schedules a (debounced) preview update
+        self.display.textChanged.connect(self._update_preview)
 
         # Sub-display for expression preview
         self.preview = QLabel()
@@ -210,7 +362,7 @@ class CalculatorWindow(QMainWindow):
             btn.setMinimumSize(QSize(72, 64))
             btn.setCursor(Qt.PointingHandCursor)
             btn.setObjectName('BtnPrimary' if mapping.role == 'digit' else ('BtnAccent' if mapping.value in {'=', '+', '−', '×', '÷'} else 'BtnSecondary'))
-            btn.clicked.connect(lambda checked=False, m=mapping: self._on_button(m))
+            btn.clicked.connect(partial(self._on_button_checked, mapping))
             grid.addWidget(btn, row, col)
             col += 1
             if col >= 4:
@@ -224,17 +376,17 @@ class CalculatorWindow(QMainWindow):
         backspace_btn = QPushButton('⌫')
         backspace_btn.setObjectName('BtnUtility')
         backspace_btn.setMinimumHeight(52)
-        backspace_btn.clicked.connect(lambda: self._on_backspace())
+        backspace_btn.clicked.connect(self._on_backspace)
 
         dot_btn = QPushButton('.')
         dot_btn.setObjectName('BtnUtility')
         dot_btn.setMinimumHeight(52)
-        dot_btn.clicked.connect(lambda: self._append_token('.'))
+        dot_btn.clicked.connect(partial(self._on_token_clicked, '.'))
 
         pow_btn = QPushButton('^')
         pow_btn.setObjectName('BtnUtility')
         pow_btn.setMinimumHeight(52)
-        pow_btn.clicked.connect(lambda: self._append_token('**'))
+        pow_btn.clicked.connect(partial(self._on_token_clicked, '**'))
 
         utils_layout.addWidget(backspace_btn)
         utils_layout.addWidget(dot_btn)
@@ -247,102 +399,19 @@ class CalculatorWindow(QMainWindow):
         self._install_shortcuts()
 
     def _apply_theme(self) -> None:
+        base = ''
         try:
             import qdarktheme  # type: ignore
-            self.setStyleSheet(qdarktheme.load_stylesheet('dark'))
+            base = qdarktheme.load_stylesheet('dark')
         except Exception:
             pass
 
-        # Add custom accent and glass styles
-        self.setStyleSheet(self.styleSheet() + self._custom_qss())
-
-    def _custom_qss(self) -> str:
-        return (
-            """
-            QWidget {
-                background-color: #0f1226;
-            }
-            #Preview {
-                color: #92a0b3;
-                padding: 6px 10px;
-                font-size: 13px;
-            }
-            #Display {
-                color: #e6f1ff;
-                background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 rgba(23, 30, 64, 190),
-                                            stop:1 rgba(21, 18, 40, 190));
-                border: 1px solid rgba(255, 255, 255, 24);
-                border-radius: 14px;
-                padding: 12px 16px;
-                selection-background-color: #3a65ff;
-                selection-color: white;
-            }
-            QPushButton {
-                font: 600 18px 'Inter';
-                border-radius: 14px;
-                padding: 10px 14px;
-                border: 1px solid rgba(255, 255, 255, 18);
-                color: #e6f1ff;
-            }
-            QPushButton#BtnPrimary {
-                background: qlineargradient(spread:pad, x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #1e274f, stop:1 #141a36);
-            }
-            QPushButton#BtnSecondary {
-                background: qlineargradient(spread:pad, x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #1a203f, stop:1 #10142b);
-                color: #b9c7dd;
-            }
-            QPushButton#BtnAccent {
-                background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #6d3aff, stop:1 #3a65ff);
-                border: 0px solid transparent;
-                color: white;
-            }
-            QPushButton#BtnUtility {
-                background: qlineargradient(spread:pad, x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #182045, stop:1 #0f1631);
-                color: #d2dcf1;
-            }
-            QPushButton:hover {
-                filter: brightness(110%);
-            }
-            QPushButton:pressed {
-                transform: translateY(1px);
-                filter: brightness(96%);
-            }
-            """
-        )
+        self.setStyleSheet(base + self._CUSTOM_QSS)
 
     def _install_shortcuts(self) -> None:
-        # Basic digits and operators
-        for key in list('0123456789+-*/().'):
-            sc = QAction(self)
-            sc.setShortcut(QKeySequence(key))
-            sc.triggered.connect(lambda checked=False, k=key: self._key_input(k))
-            self.addAction(sc)
-
-        # Enter for equals
-        enter = QAction(self)
-        enter.setShortcut(QKeySequence(Qt.Key_Return))
-        enter.triggered.connect(self._on_equals)
-        self.addAction(enter)
-
-        enter2 = QAction(self)
-        enter2.setShortcut(QKeySequence(Qt.Key_Enter))
-        enter2.triggered.connect(self._on_equals)
-        self.addAction(enter2)
-
-        back = QAction(self)
-        back.setShortcut(QKeySequence(Qt.Key_Backspace))
-        back.triggered.connect(self._on_backspace)
-        self.addAction(back)
-
-        esc = QAction(self)
-        esc.setShortcut(QKeySequence(Qt.Key_Escape))
-        esc.triggered.connect(self._on_clear)
-        self.addAction(esc)
+        for key, handler in self._shortcut_map.items():
+            shortcut = QShortcut(QKeySequence(key), self)
+            shortcut.activated.connect(handler)
 
     def _key_input(self, key: str) -> None:
         mapping = {'*': '×', '/': '÷', '-': '−'}
@@ -351,6 +420,14 @@ class CalculatorWindow(QMainWindow):
         else:
             self._append_token(key)
 
+    def _on_button_checked(self, mapping: TokenMapping, checked: bool = False) -> None:
+        # Adapts QPushButton.clicked(bool) to _on_button
+        self._on_button(mapping)
+
+    def _on_token_clicked(self, token: str, checked: bool = False) -> None:
+        # Adapts QPushButton.clicked(bool) to _append_token
+        self._append_token(token)
+
     def _on_button(self, mapping: TokenMapping) -> None:
         if mapping.value == 'AC':
             self._on_clear()
@@ -367,67 +444,89 @@ class CalculatorWindow(QMainWindow):
         self._append_token(mapping.value)
 
     def _append_token(self, token: str) -> None:
-        if self.display.text() == '0' and token not in ('.', '(', ')'):
-            self.display.setText('')
-        current = self.display.text()
+        self._set_display(self._join_token(self._buf, token))
+
+    @classmethod
+    def _join_token(cls, current: str, token: str) -> str:
+        if current == '0' and token not in ('.', '(', ')'):
+            current = ''
         # Prevent duplicate operators
-        if token in ('+', '−', '×', '÷', '**') and current.endswith(('+', '−', '×', '÷', '**')):
-            current = current[:-1]
-        self.display.setText(current + token)
-        self._update_preview()
+        if (token in cls._OP_CHARS or token == '**') and current:
+            if current[-1] in cls._OP_CHARS:
+                current = current[:-1]
+            elif current.endswith('**'):
+                current = current[:-2]
+        return current + token
 
     def _on_backspace(self) -> None:
-        text = self.display.text()
-        if len(text) > 1:
-            self.display.setText(text[:-1])
-        else:
-            self.display.setText('0')
-        self._update_preview()
+        text = self._buf
+        self._set_display(text[:-1] if len(text) > 1 else '0')
 
     def _on_clear(self) -> None:
-        self.display.setText('0')
-        self.preview.setText('')
+        self._set_display('0')
+        self._set_preview('')
 
     def _toggle_negate(self) -> None:
-        text = self.display.text()
+        text = self._buf
         if text.startswith('−'):
-            self.display.setText(text[1:])
+            self._set_display(text[1:])
         elif text != '0':
-            self.display.setText('−' + text)
-        self._update_preview()
+            self._set_display('−' + text)
 
     def _apply_percent(self) -> None:
         # Percent of the preceding number
-        text = self.display.text()
+        text = self._buf
         try:
             result = self.evaluator.evaluate(text.replace('%', '') + '/100')
-            self.display.setText(self._format_result(result))
-            self.preview.setText('')
+            self._set_display(self._format_result(result))
+            self._set_preview('')
         except Exception:
-            self.preview.setText('Error')
+            self._set_preview('Error')
 
     def _on_equals(self) -> None:
-        expr = self.display.text()
+        expr = self._buf
         try:
             result = self.evaluator.evaluate(expr)
-            self.display.setText(self._format_result(result))
-            self.preview.setText('')
+            self._set_display(self._format_result(result))
+            self._set_preview('')
         except Exception:
-            self.preview.setText('Error')
+            self._set_preview('Error')
+
+    def _set_display(self, text: str) -> None:
+        self._buf = text
+        self.display.setText(text)
+
+    def _set_preview(self, text: str) -> None:
+        # Drop any pending preview so it cannot overwrite this text
+        self._preview_timer.stop()
+        self.preview.setText(text)
+
+    @classmethod
+    def _likely_incomplete(cls, text: str) -> bool:
+        return not text or text[-1] in cls._INCOMPLETE_TAIL or text.count('(') != text.count(')')
 
     def _update_preview(self) -> None:
-        expr = self.display.text()
+        # Mid-typing states like '3+' can never evaluate; skip the parse entirely
+        if self._likely_incomplete(self._buf):
+            self._set_preview('')
+            return
+        self._preview_timer.start()
+
+    def _do_update_preview(self) -> None:
+        expr = self._buf
         try:
             result = self.evaluator.evaluate(expr)
             self.preview.setText(self._format_result(result))
         except Exception:
             self.preview.setText('')
 
-    def _format_result(self, value: float) -> str:
+    @staticmethod
+    def _format_result(value: float) -> str:
         if isinstance(value, float):
             if value.is_integer():
                 return str(int(value))
-            return ('{0:.10f}'.format(value)).rstrip('0').rstrip('.')
+            # Round away float noise at 10 decimals, but keep large values whole
+            return format(round(value, 10), '.15g')
         return str(value)
 
 
@@ -0,0 +1,69 @@
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from main import SafeEvaluator  # noqa: E402
+
+
+class SafeEvaluatorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.evaluator = SafeEvaluator()
+
+    def evaluate(self, expression: str):
+        # Evaluate twice so both the compile path and the cached path are covered
+        first = self.evaluator.evaluate(expression)
+        self.assertEqual(first, self.evaluator.evaluate(expression))
+        return first
+
+    def assertRejected(self, expression: str, exc: type = ValueError) -> None:
+        for _ in range(2):
+            with self.assertRaises(exc):
+                self.evaluator.evaluate(expression)
+
+    def test_arithmetic(self) -> None:
+        self.assertEqual(self.evaluate('1+2'), 3)
+        self.assertEqual(self.evaluate('2×3−1'), 5)
+        self.assertEqual(self.evaluate('7÷2'), 3.5)
+        self.assertEqual(self.evaluate('10//3'), 3)
+        self.assertEqual(self.evaluate('10%4'), 2)
+        self.assertEqual(self.evaluate('−(3)'), -3)
+
+    def test_constant_folding(self) -> None:
+        self.assertEqual(self.evaluate('pi/4'), math.pi / 4)
+        self.assertEqual(self.evaluate('2*3+sin(0)'), 6.0)
+        self.assertEqual(self.evaluate('sqrt(16)+1'), 5.0)
+        self.assertEqual(self.evaluate('2**3'), 8)
+
+    def test_runtime_errors_survive_folding(self) -> None:
+        self.assertRejected('1/0', ZeroDivisionError)
+        self.assertRejected('sqrt(−1)')
+
+    def test_exponent_guard(self) -> None:
+        self.assertRejected('2**100')
+        self.assertRejected('9**9**9')
+        self.assertRejected('1e7**2')
+
+    def test_disallowed_input(self) -> None:
+        for expression in (
+            '_pow(2,3)',
+            '__import__("os")',
+            '(1).real',
+            'foo',
+            'foo(1)',
+            '"a"',
+            '(1,2)',
+            '[1]',
+            '2@3',
+            'lambda: 1',
+            'round(2.5, ndigits=1)',
+            '1+',
+        ):
+            with self.subTest(expression=expression):
+                self.assertRejected(expression)
+
+
+if __name__ == '__main__':
+    unittest.main()
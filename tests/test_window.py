@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from main import CalculatorWindow  # noqa: E402
+
+
+class FormatResultTest(unittest.TestCase):
+    def test_rounds_float_noise(self) -> None:
+        self.assertEqual(CalculatorWindow._format_result(100.1 - 100), '0.1')
+        self.assertEqual(CalculatorWindow._format_result(12.3 - 12), '0.3')
+        self.assertEqual(CalculatorWindow._format_result(5.1 - 5), '0.1')
+        self.assertEqual(CalculatorWindow._format_result(0.1 + 0.2), '0.3')
+
+    def test_keeps_ten_decimals(self) -> None:
+        self.assertEqual(CalculatorWindow._format_result(1 / 3), '0.3333333333')
+
+    def test_keeps_large_values_whole(self) -> None:
+        self.assertEqual(CalculatorWindow._format_result(12345678901.5), '12345678901.5')
+        self.assertEqual(CalculatorWindow._format_result(10000000000.5), '10000000000.5')
+
+    def test_integers(self) -> None:
+        self.assertEqual(CalculatorWindow._format_result(4.0), '4')
+        self.assertEqual(CalculatorWindow._format_result(7), '7')
+
+
+class JoinTokenTest(unittest.TestCase):
+    def test_operator_replaces_power(self) -> None:
+        self.assertEqual(CalculatorWindow._join_token('2**', '+'), '2+')
+
+    def test_power_replaces_operator(self) -> None:
+        self.assertEqual(CalculatorWindow._join_token('2×', '**'), '2**')
+
+    def test_operator_replaces_operator(self) -> None:
+        self.assertEqual(CalculatorWindow._join_token('2+', '×'), '2×')
+
+    def test_leading_zero(self) -> None:
+        self.assertEqual(CalculatorWindow._join_token('0', '+'), '+')
+        self.assertEqual(CalculatorWindow._join_token('0', '7'), '7')
+        self.assertEqual(CalculatorWindow._join_token('0', '.'), '0.')
+
+    def test_appends(self) -> None:
+        self.assertEqual(CalculatorWindow._join_token('12', '3'), '123')
+        self.assertEqual(CalculatorWindow._join_token('2', '**'), '2**')
+
+
+class LikelyIncompleteTest(unittest.TestCase):
+    def test_incomplete(self) -> None:
+        for text in ('', '3+', '2×(', '(3'):
+            with self.subTest(text=text):
+                self.assertTrue(CalculatorWindow._likely_incomplete(text))
+
+    def test_complete(self) -> None:
+        # '3.' is a valid number and must still get a preview
+        for text in ('3.', '(3)', '3'):
+            with self.subTest(text=text):
+                self.assertFalse(CalculatorWindow._likely_incomplete(text))
+
+
+if __name__ == '__main__':
+    unittest.main()